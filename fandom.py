@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from ttl_cache import TTLCache
 
 
 REQUEST_TIMEOUT = 10
 
+# Shared session so repeated lookups reuse keep-alive connections per wiki host.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Formatted replies keyed by (wiki, lowercased topic); stale entries back up outages.
+_RESULT_CACHE: TTLCache[str] = TTLCache(maxsize=512, ttl=300)
+
 
 def search_fandom(wiki: str, topic: str) -> str:
     """Search a Fandom wiki and return a concise summary."""
@@ -15,18 +25,32 @@ def search_fandom(wiki: str, topic: str) -> str:
     if not wiki or not topic:
         return "Usage: `UOI fandom <wiki> <topic>`"
 
+    cache_key = (wiki, topic.lower())
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     url = f"https://{wiki}.fandom.com/api/v1/Search/List"
     params = {"query": topic, "limit": 1}
 
     try:
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
         if response.status_code == 404:
             return "That wiki was not found."
         response.raise_for_status()
         payload = response.json()
     except requests.RequestException:
+        stale = _RESULT_CACHE.get_stale(cache_key)
+        if stale is not None:
+            return stale
         return "Fandom search is temporarily unavailable."
 
+    result = _format_result(payload, wiki, topic)
+    _RESULT_CACHE.set(cache_key, result)
+    return result
+
+
+def _format_result(payload: object, wiki: str, topic: str) -> str:
     items = payload.get("items", []) if isinstance(payload, dict) else []
     if not items:
         return f"No Fandom results found for `{topic}` on `{wiki}`."
@@ -0,0 +1,38 @@
+"""JSON encode/decode helpers backed by orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes) -> Any:
+    """Parse UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+    ).encode("utf-8")
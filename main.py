@@ -3,40 +3,65 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
-from typing import List
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 import discord
-from groq import APIError, Groq, RateLimitError
+from groq import APIConnectionError, APIError, AsyncGroq, InternalServerError, RateLimitError
 
+import json_codec
 from characteristics import get_system_prompt
 from fandom import search_fandom
 from memory_manager import MemoryManager
 from quicklink import build_quicklink
+from rate_limiter import TokenBucket
+from reply_streamer import ReplyStreamer
 from repository_manager import RepositoryManager
 from setup_manager import SetupManager
 from token_manager import TokenManager
-from usage_counter import update_and_format_usage
+from ttl_cache import TTLCache
+from usage_counter import NO_USAGE, TokenUsage, update_and_format_usage
 from website import StatusWebsite
 
 
 BOT_PREFIX = "UOI "
+BOT_PREFIX_LEN = len(BOT_PREFIX)
+BOT_PREFIXES = (BOT_PREFIX, BOT_PREFIX.lower())
 DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+FALLBACK_MODEL = os.getenv("GROQ_FALLBACK_MODEL", "llama-3.1-8b-instant")
+GROQ_MAX_ATTEMPTS = 3
+TEMPERATURE = 0.7
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = int(os.getenv("GROQ_TPM", "12000"))
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "8"))
+FLUSH_INTERVAL_SECONDS = 2.0
+SESSION_SWEEP_INTERVAL_SECONDS = 60.0
+STREAM_EDIT_INTERVAL_SECONDS = 0.5
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
-ADMIN_IDS = {
+ADMIN_IDS = frozenset(
     int(value.strip())
     for value in os.getenv("ADMIN_IDS", "").split(",")
     if value.strip().isdigit()
-}
+)
+
+# Shared by every request; callers must not mutate it.
+SYSTEM_MESSAGE = {"role": "system", "content": get_system_prompt()}
 
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 intents.messages = True
+intents.members = False
+intents.presences = False
 
-client = discord.Client(intents=intents)
+# The bot only needs channel IDs, so skip member chunking and the message cache.
+client = discord.Client(intents=intents, chunk_guilds_at_startup=False, max_messages=None)
 memory_manager = MemoryManager()
 repository_manager = RepositoryManager("repository.json")
 token_manager = TokenManager("token_stats.json")
@@ -44,45 +69,205 @@ setup_manager = SetupManager("setup_config.json")
 
 website_port = int(os.getenv("PORT", "8080"))
 status_website = StatusWebsite(token_manager.get_stats, port=website_port)
-status_website.start()
 
 
-def _build_messages(user_id: int, user_prompt: str) -> List[dict]:
-    repo_entries = repository_manager.get_latest_entries(limit=3)
-    memory_messages = memory_manager.get_session_messages(user_id)
+@dataclass(frozen=True)
+class ChatReply:
+    """Final text, token usage and answering model of a streamed Groq completion."""
+
+    text: str
+    usage: TokenUsage
+    model: str
+
+
+_groq_client: Optional[AsyncGroq] = None
+_response_cache: TTLCache[ChatReply] = TTLCache(maxsize=1024, ttl=600)
+_inflight_requests: Dict[bytes, "asyncio.Future[ChatReply]"] = {}
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+# Bounded pool for blocking I/O so bursts queue instead of growing the default executor.
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="io")
+
+# Mirror Groq's per-minute request and token limits so bursts queue locally
+# instead of bouncing off 429s.
+_request_bucket = TokenBucket(rate=GROQ_RPM / 60, capacity=GROQ_RPM)
+_token_bucket = TokenBucket(rate=GROQ_TPM / 60, capacity=GROQ_TPM)
+# Caps streams open at once; the buckets only pace how fast new ones start.
+_groq_semaphore = asyncio.Semaphore(GROQ_CONCURRENCY)
+
+
+def _get_groq_client() -> AsyncGroq:
+    global _groq_client
+    if _groq_client is None:
+        # Retries are handled by _dispatch_groq so they pass through the rate limiter.
+        _groq_client = AsyncGroq(api_key=GROQ_API_KEY, max_retries=0)
+    return _groq_client
 
-    repository_context = "\n".join(
-        f"- [{entry.get('timestamp', '')}] {entry.get('content', '')}"
-        for entry in repo_entries
-    ) or "- No repository memory yet."
 
-    messages: List[dict] = [
-        {"role": "system", "content": get_system_prompt()},
-        {
-            "role": "system",
-            "content": f"Latest repository memory (most recent first):\n{repository_context}",
-        },
-    ]
+def _build_messages(user_prompt: str, memory_messages: List[Dict[str, str]]) -> List[dict]:
+    repository_context = repository_manager.get_latest_context_block()
+
+    # Keep content shared by every user first and per-user history last so Groq's
+    # automatic prefix cache can reuse the leading bytes across requests.
+    messages: List[dict] = [SYSTEM_MESSAGE]
+    if repository_context:
+        messages.append(
+            {
+                "role": "system",
+                "content": f"Latest repository memory (most recent first):\n{repository_context}",
+            }
+        )
 
     messages.extend(memory_messages)
     messages.append({"role": "user", "content": user_prompt})
     return messages
 
 
-async def _call_groq(messages: List[dict]):
+def _estimate_tokens(messages: List[dict]) -> int:
+    # Roughly four characters per token for English chat text.
+    return sum(len(message.get("content", "")) for message in messages) // 4 + 1
+
+
+def _response_cache_key(messages: List[dict]) -> bytes:
+    payload = json_codec.dumps(
+        {"m": DEFAULT_MODEL, "msgs": messages, "t": TEMPERATURE},
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    response = getattr(exc, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return min(float(retry_after), 30.0)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, 8) + random.random() * 0.5
+
+
+async def _dispatch_groq(
+    messages: List[dict],
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> ChatReply:
+    groq_client = _get_groq_client()
+    estimated_tokens = _estimate_tokens(messages)
+    streamed = False
+
+    async def _attempt(model: str) -> ChatReply:
+        nonlocal streamed
+        await _request_bucket.acquire()
+        await _token_bucket.acquire(estimated_tokens)
+        parts: List[str] = []
+        usage = NO_USAGE
+        async with _groq_semaphore:
+            stream = await groq_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=TEMPERATURE,
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        if on_delta is not None:
+                            streamed = True
+                            on_delta(delta)
+                # Groq reports usage on the final chunk under its x_groq extension.
+                x_groq = chunk.x_groq
+                if x_groq is not None and x_groq.usage is not None:
+                    usage = TokenUsage.from_groq(x_groq.usage)
+
+        if usage is not NO_USAGE:
+            _token_bucket.refund(estimated_tokens - usage.total_tokens)
+        return ChatReply("".join(parts), usage, model)
+
+    model = DEFAULT_MODEL
+    for attempt in range(GROQ_MAX_ATTEMPTS - 1):
+        try:
+            return await _attempt(model)
+        except (RateLimitError, APIConnectionError, InternalServerError) as exc:
+            # Text already shown to the user cannot be taken back by a retry.
+            if streamed:
+                raise
+            # Repeated 429s on the main model: give the last attempt to the fallback.
+            if isinstance(exc, RateLimitError) and attempt == GROQ_MAX_ATTEMPTS - 2:
+                model = FALLBACK_MODEL
+            await asyncio.sleep(_retry_delay(exc, attempt))
+    return await _attempt(model)
+
+
+async def _call_groq(
+    messages: List[dict],
+    cacheable: bool = False,
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> Tuple[ChatReply, bool]:
+    """Return ``(reply, shared)`` for the given chat messages.
+
+    ``on_delta`` receives text fragments on the event loop as they stream in.
+    ``shared`` is true when the reply came from the response cache or from an
+    identical request that was already in flight, i.e. no tokens were spent and
+    ``on_delta`` was never called.
+    """
     if not GROQ_API_KEY:
         raise RuntimeError("Missing GROQ_API_KEY environment variable.")
 
-    groq_client = Groq(api_key=GROQ_API_KEY)
+    cache_key = _response_cache_key(messages)
+    if cacheable:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached, True
 
-    def _request():
-        return groq_client.chat.completions.create(
-            model=DEFAULT_MODEL,
-            messages=messages,
-            temperature=0.7,
-        )
+    pending = _inflight_requests.get(cache_key)
+    if pending is not None:
+        return await asyncio.shield(pending), True
 
-    return await asyncio.to_thread(_request)
+    task = asyncio.ensure_future(_dispatch_groq(messages, on_delta))
+    _inflight_requests[cache_key] = task
+    try:
+        reply = await asyncio.shield(task)
+    finally:
+        _inflight_requests.pop(cache_key, None)
+
+    # The key assumes DEFAULT_MODEL, so fallback replies are never cached under it.
+    if cacheable and reply.model == DEFAULT_MODEL and reply.text.strip():
+        _response_cache.set(cache_key, reply)
+    return reply, False
+
+
+def _flush_state() -> None:
+    repository_manager.flush()
+    token_manager.flush()
+
+
+async def _flush_periodically() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+        try:
+            await loop.run_in_executor(_io_executor, _flush_state)
+        except OSError as exc:
+            print(f"Failed to persist bot state: {exc}")
+
+
+async def _sweep_sessions_periodically() -> None:
+    # Runs on the loop thread because MemoryManager is not thread-safe.
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        memory_manager.clear_expired_sessions()
+
+
+def _start_background_task(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+@client.event
+async def setup_hook() -> None:
+    _start_background_task(_flush_periodically())
+    _start_background_task(_sweep_sessions_periodically())
 
 
 @client.event
@@ -90,107 +275,154 @@ async def on_ready() -> None:
     print(f"Logged in as {client.user} (id={client.user.id if client.user else 'unknown'})")
 
 
-@client.event
-async def on_message(message: discord.Message) -> None:
-    if message.author.bot:
+async def _handle_setup(message: discord.Message, rest: str) -> None:
+    if message.guild is None:
+        await message.channel.send("`UOI setup` can only be used inside a server.")
         return
+    loop = asyncio.get_running_loop()
+    # Persists with an fsync, so keep it off the event loop.
+    await loop.run_in_executor(_io_executor, setup_manager.set_channel, message.guild.id, message.channel.id)
+    await message.channel.send(
+        f"Setup complete. I will now reply only in {message.channel.mention}."
+    )
 
-    content = (message.content or "").strip()
-    if not content.startswith(BOT_PREFIX):
+
+async def _handle_unset(message: discord.Message, rest: str) -> None:
+    if message.guild is None:
+        await message.channel.send("`UOI unset` can only be used inside a server.")
         return
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_io_executor, setup_manager.unset_channel, message.guild.id)
+    await message.channel.send("Channel restriction removed for this server.")
 
-    if message.guild:
-        allowed_channel = setup_manager.get_channel(message.guild.id)
-        if allowed_channel and message.channel.id != allowed_channel:
-            return
 
-    command_body = content[len(BOT_PREFIX):].strip()
-    if not command_body:
-        return
+async def _handle_link(message: discord.Message, rest: str) -> None:
+    await message.channel.send(build_quicklink(message, rest))
 
-    lower = command_body.lower()
 
-    if lower == "setup":
-        if message.guild is None:
-            await message.channel.send("`UOI setup` can only be used inside a server.")
-            return
-        setup_manager.set_channel(message.guild.id, message.channel.id)
-        await message.channel.send(
-            f"Setup complete. I will now reply only in {message.channel.mention}."
-        )
+async def _handle_fandom(message: discord.Message, rest: str) -> None:
+    parts = rest.split(maxsplit=1)
+    if len(parts) < 2:
+        await message.channel.send("Usage: `UOI fandom <wiki> <topic>`")
         return
+    wiki, topic = parts
+    loop = asyncio.get_running_loop()
+    await message.channel.send(await loop.run_in_executor(_io_executor, search_fandom, wiki, topic))
 
-    if lower == "unset":
-        if message.guild is None:
-            await message.channel.send("`UOI unset` can only be used inside a server.")
-            return
-        setup_manager.unset_channel(message.guild.id)
-        await message.channel.send("Channel restriction removed for this server.")
+
+CommandHandler = Callable[[discord.Message, str], Awaitable[None]]
+
+# Dispatched on the lowercased first word of the command body.
+_COMMANDS: Dict[str, CommandHandler] = {
+    "link": _handle_link,
+    "fandom": _handle_fandom,
+}
+# Only match when given without arguments; "UOI setup the raid" goes to the model.
+_BARE_COMMANDS: Dict[str, CommandHandler] = {
+    "setup": _handle_setup,
+    "unset": _handle_unset,
+}
+
+
+@client.event
+async def on_message(message: discord.Message) -> None:
+    if message.author.bot:
         return
 
-    if lower.startswith("link"):
-        question = command_body[4:].strip()
-        await message.channel.send(build_quicklink(message, question))
+    raw = message.content or ""
+    # Most messages are unrelated chatter; reject them before allocating a stripped copy.
+    if not raw.startswith(BOT_PREFIXES) and not (raw[:1].isspace() and raw.lstrip().startswith(BOT_PREFIXES)):
         return
+    content = raw.strip()
 
-    if lower.startswith("fandom"):
-        rest = command_body[6:].strip()
-        if not rest:
-            await message.channel.send("Usage: `UOI fandom <wiki> <topic>`")
-            return
-        parts = rest.split(maxsplit=1)
-        if len(parts) < 2:
-            await message.channel.send("Usage: `UOI fandom <wiki> <topic>`")
+    if message.guild:
+        allowed_channel = setup_manager.get_channel(message.guild.id)
+        if allowed_channel is not None and message.channel.id != allowed_channel:
             return
-        wiki, topic = parts
-        await message.channel.send(search_fandom(wiki, topic))
+
+    command_body = content[BOT_PREFIX_LEN:].strip()
+    if not command_body:
+        return
+
+    head, *tail = command_body.split(maxsplit=1)
+    command = head.lower()
+    rest = tail[0] if tail else ""
+    handler = _COMMANDS.get(command) or (None if rest else _BARE_COMMANDS.get(command))
+    if handler is not None:
+        await handler(message, rest)
         return
 
     user_prompt = command_body
     user_id = message.author.id
 
+    streamer = ReplyStreamer(message.channel, interval=STREAM_EDIT_INTERVAL_SECONDS)
     try:
-        messages = _build_messages(user_id, user_prompt)
-        completion = await _call_groq(messages)
+        memory_messages = memory_manager.get_session_messages(user_id)
+        messages = _build_messages(user_prompt, memory_messages)
+        # Replies that depend on a running conversation are never cached.
+        reply, shared = await _call_groq(
+            messages,
+            cacheable=not memory_messages,
+            on_delta=streamer.feed,
+        )
     except RuntimeError as exc:
-        await message.channel.send(str(exc))
+        await streamer.finish(str(exc))
         return
     except RateLimitError:
-        await message.channel.send("Groq rate limit reached. Please try again shortly.")
+        await streamer.finish("Groq rate limit reached. Please try again shortly.")
         return
     except APIError:
-        await message.channel.send("Groq API error encountered. Please try again in a moment.")
+        await streamer.finish("Groq API error encountered. Please try again in a moment.")
         return
     except Exception:
-        await message.channel.send("Unexpected error while generating a response.")
+        await streamer.finish("Unexpected error while generating a response.")
         return
 
-    choices = getattr(completion, "choices", [])
-    reply_text = ""
-    if choices:
-        first_choice = choices[0]
-        if getattr(first_choice, "message", None):
-            reply_text = getattr(first_choice.message, "content", "") or ""
-
+    reply_text = reply.text
     if not reply_text.strip():
-        await message.channel.send("I received an empty response from the model. Please retry.")
+        await streamer.finish("I received an empty response from the model. Please retry.")
         return
 
     # Store conversation only in session memory (NOT repository)
     memory_manager.add_message(user_id, "user", user_prompt)
     memory_manager.add_message(user_id, "assistant", reply_text)
-    memory_manager.clear_expired_sessions()
 
     if user_id in ADMIN_IDS:
+        # A shared reply consumed no tokens, so it is recorded as zero usage.
         reply_text += update_and_format_usage(
-            getattr(completion, "usage", None),
+            NO_USAGE if shared else reply.usage,
             token_manager,
         )
 
-    await message.channel.send(reply_text)
+    await streamer.finish(reply_text)
+
+
+async def _run_bot() -> None:
+    try:
+        async with client:
+            await client.start(DISCORD_TOKEN)
+    finally:
+        if _groq_client is not None:
+            await _groq_client.close()
 
 
 if __name__ == "__main__":
     if not DISCORD_TOKEN:
         raise RuntimeError("Missing DISCORD_TOKEN environment variable.")
-    client.run(DISCORD_TOKEN)
+    # Bound here rather than at import so importing main never opens a port.
+    status_website.start()
+    try:
+        import uvloop
+    except ImportError:
+        run = asyncio.run
+    else:
+        run = uvloop.run
+    # Equivalent to client.run(), but keeps the loop alive long enough to close
+    # the AsyncGroq client on the loop that owns its connections.
+    discord.utils.setup_logging()
+    try:
+        run(_run_bot())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _flush_state()
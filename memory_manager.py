@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+import heapq
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
 
 
 class MemoryManager:
@@ -11,53 +13,50 @@ class MemoryManager:
 
     def __init__(self, expiry_minutes: int = 30, max_exchanges: int = 6) -> None:
         self.expiry_minutes = expiry_minutes
+        self._expiry_seconds = expiry_minutes * 60
         self.max_messages = max_exchanges * 2
         self._sessions: Dict[int, Dict[str, object]] = {}
+        # (last_active, user_id) pushed on every touch; stale entries are skipped lazily.
+        self._expiry_heap: List[Tuple[float, int]] = []
 
-    def _now(self) -> datetime:
-        return datetime.now(timezone.utc)
+    def _now(self) -> float:
+        return time.monotonic()
 
-    def _is_expired(self, last_active: datetime) -> bool:
-        return self._now() - last_active > timedelta(minutes=self.expiry_minutes)
+    def _is_expired(self, last_active: float) -> bool:
+        return self._now() - last_active > self._expiry_seconds
+
+    def _new_session(self, user_id: int) -> None:
+        now = self._now()
+        self._sessions[user_id] = {"messages": deque(maxlen=self.max_messages), "last_active": now}
+        heapq.heappush(self._expiry_heap, (now, user_id))
 
     def _ensure_session(self, user_id: int) -> None:
         session = self._sessions.get(user_id)
-        if not session:
-            self._sessions[user_id] = {"messages": [], "last_active": self._now()}
-            return
-
-        last_active = session["last_active"]
-        if isinstance(last_active, datetime) and self._is_expired(last_active):
-            self._sessions[user_id] = {"messages": [], "last_active": self._now()}
+        if not session or self._is_expired(session["last_active"]):
+            self._new_session(user_id)
 
     def add_message(self, user_id: int, role: str, content: str) -> None:
         """Append a message to a user's session and enforce retention rules."""
         self._ensure_session(user_id)
         session = self._sessions[user_id]
-        messages = session["messages"]
-        if isinstance(messages, list):
-            messages.append({"role": role, "content": content})
-            if len(messages) > self.max_messages:
-                del messages[:-self.max_messages]
-        session["last_active"] = self._now()
+        messages: Deque[Dict[str, str]] = session["messages"]
+        messages.append({"role": role, "content": content})
+        now = self._now()
+        session["last_active"] = now
+        heapq.heappush(self._expiry_heap, (now, user_id))
 
     def get_session_messages(self, user_id: int) -> List[Dict[str, str]]:
         """Return session messages if active, otherwise an empty list."""
         self._ensure_session(user_id)
-        session = self._sessions.get(user_id, {})
-        session_messages = session.get("messages", [])
-        if isinstance(session_messages, list):
-            return list(session_messages)
-        return []
+        return list(self._sessions[user_id]["messages"])
 
     def clear_expired_sessions(self) -> None:
         """Remove all expired sessions from memory."""
-        now = self._now()
-        to_remove = []
-        for user_id, session in self._sessions.items():
-            last_active = session.get("last_active")
-            if isinstance(last_active, datetime) and now - last_active > timedelta(minutes=self.expiry_minutes):
-                to_remove.append(user_id)
-
-        for user_id in to_remove:
-            self._sessions.pop(user_id, None)
+        cutoff = self._now() - self._expiry_seconds
+        heap = self._expiry_heap
+        while heap and heap[0][0] < cutoff:
+            _, user_id = heapq.heappop(heap)
+            session = self._sessions.get(user_id)
+            # A newer heap entry exists if the session was touched since this one was pushed.
+            if session is not None and session["last_active"] < cutoff:
+                del self._sessions[user_id]
@@ -8,13 +8,17 @@ import discord
 
 
 CHANNEL_MENTION_PATTERN = re.compile(r"<#(\d+)>")
+MISSING_MENTION_REPLY = "Please mention a channel, e.g. `UOI link #general`."
 
 
 def build_quicklink(message: discord.Message, question: str) -> str:
     """Return a quicklink markdown URL for a mentioned channel."""
+    # Cheap substring probe before the regex; most bad input has no mention at all.
+    if "<#" not in question:
+        return MISSING_MENTION_REPLY
     match = CHANNEL_MENTION_PATTERN.search(question)
     if not match:
-        return "Please mention a channel, e.g. `UOI link #general`."
+        return MISSING_MENTION_REPLY
 
     channel_id = int(match.group(1))
     guild = message.guild
@@ -0,0 +1,41 @@
+"""Client-side token bucket used to smooth egress to rate-limited APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate`` units per second."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` units are available and consume them.
+
+        Waiters are served in arrival order; requests larger than the bucket
+        are clamped to its capacity so they can still proceed.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return unused units; a negative amount charges an underestimate."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
@@ -0,0 +1,56 @@
+"""Mirror a streamed model reply into a single, progressively edited Discord message."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+import discord
+
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+class ReplyStreamer:
+    """Collect streamed text and publish it at most once per ``interval`` seconds."""
+
+    def __init__(self, channel: discord.abc.Messageable, interval: float = 0.5) -> None:
+        self.channel = channel
+        self.interval = interval
+        self._parts: List[str] = []
+        self._message: Optional[discord.Message] = None
+        self._pending: Optional[asyncio.Task[None]] = None
+        self._lock = asyncio.Lock()
+        self._finished = False
+
+    def feed(self, delta: str) -> None:
+        """Append a text delta; must be called on the event loop thread."""
+        self._parts.append(delta)
+        if self._pending is None:
+            self._pending = asyncio.create_task(self._publish_later())
+
+    async def _publish_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        self._pending = None
+        preview = "".join(self._parts)[:DISCORD_MESSAGE_LIMIT]
+        if preview.strip():
+            # Shielded so finish() cannot cancel a send halfway and post twice.
+            await asyncio.shield(self._publish(preview, final=False))
+
+    async def _publish(self, text: str, final: bool) -> None:
+        async with self._lock:
+            # A preview that queued behind finish() must not overwrite the final text.
+            if not final and self._finished:
+                return
+            if self._message is None:
+                self._message = await self.channel.send(text)
+            else:
+                await self._message.edit(content=text)
+
+    async def finish(self, text: str) -> None:
+        """Replace any preview with ``text``, or send it if nothing was shown yet."""
+        self._finished = True
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        await self._publish(text, final=True)
@@ -2,54 +2,101 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
+from threading import Lock
 from typing import Dict, List
 
+import json_codec
+from atomic_file import write_bytes_atomic
+
 
 class RepositoryManager:
     """Store and retrieve global long-term memory entries."""
 
-    def __init__(self, file_path: str = "repository.json") -> None:
+    def __init__(self, file_path: str = "repository.json", context_limit: int = 3) -> None:
         self.file_path = Path(file_path)
+        self.context_limit = context_limit
         self._ensure_file()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._mtime_ns = self._file_mtime_ns()
+        self._data = self._read()
+        self._dirty = False
+        self._context_block = self._format_context_block()
 
     def _ensure_file(self) -> None:
         if not self.file_path.exists():
-            self.file_path.write_text(json.dumps({"global_memory": []}, indent=2), encoding="utf-8")
+            self._write({"global_memory": []})
 
     def _read(self) -> Dict[str, List[Dict[str, str]]]:
         try:
-            with self.file_path.open("r", encoding="utf-8") as file:
-                data = json.load(file)
+            data = json_codec.loads(self.file_path.read_bytes())
             if not isinstance(data, dict) or "global_memory" not in data:
                 return {"global_memory": []}
             if not isinstance(data["global_memory"], list):
                 data["global_memory"] = []
             return data
-        except (json.JSONDecodeError, OSError):
+        except (json_codec.JSONDecodeError, OSError):
             return {"global_memory": []}
 
     def _write(self, data: Dict[str, List[Dict[str, str]]]) -> None:
-        with self.file_path.open("w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2, ensure_ascii=False)
+        write_bytes_atomic(self.file_path, json_codec.dumps(data, indent=True))
+
+    def _file_mtime_ns(self) -> int:
+        try:
+            return self.file_path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _reload_if_changed(self) -> None:
+        # The file may be edited by hand while the bot runs; a stat is far cheaper
+        # than re-parsing on every prompt.
+        mtime_ns = self._file_mtime_ns()
+        if mtime_ns == self._mtime_ns:
+            return
+        with self._lock:
+            if self._dirty:
+                return
+            self._mtime_ns = mtime_ns
+            self._data = self._read()
+            self._context_block = self._format_context_block()
+
+    def _format_context_block(self) -> str:
+        return "\n".join(
+            f"- [{entry.get('timestamp', '')}] {entry.get('content', '')}"
+            for entry in reversed(self._data["global_memory"][-self.context_limit:])
+        )
 
     def add_entry(self, content: str) -> None:
-        """Persist a memory entry with a UTC timestamp."""
-        data = self._read()
+        """Record a memory entry with a UTC timestamp; persisted on the next flush."""
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "content": content,
         }
-        data["global_memory"].append(entry)
-        self._write(data)
+        with self._lock:
+            self._data["global_memory"].append(entry)
+            self._dirty = True
+            self._context_block = self._format_context_block()
 
     def get_latest_entries(self, limit: int = 3) -> List[Dict[str, str]]:
         """Return most recent repository memory entries first."""
-        data = self._read()
-        entries = data.get("global_memory", [])
-        if not isinstance(entries, list):
-            return []
+        self._reload_if_changed()
+        entries = self._data["global_memory"]
         return list(reversed(entries[-limit:]))
-      
+
+    def get_latest_context_block(self) -> str:
+        """Return the latest ``context_limit`` entries formatted for the model prompt, or ``""``."""
+        self._reload_if_changed()
+        return self._context_block
+
+    def flush(self) -> None:
+        """Write pending entries to disk, if any."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = {"global_memory": list(self._data["global_memory"])}
+                self._dirty = False
+            self._write(snapshot)
+            self._mtime_ns = self._file_mtime_ns()
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
+from threading import Lock
 from typing import Dict, Optional
 
+import json_codec
+from atomic_file import write_bytes_atomic
+
 
 class SetupManager:
     """Manage per-guild allowed channel configuration."""
@@ -13,6 +16,9 @@ class SetupManager:
     def __init__(self, file_path: str = "setup_config.json") -> None:
         self.file_path = Path(file_path)
         self._ensure_file()
+        self._lock = Lock()
+        # Hydrated once; this process is the only writer, so lookups never touch disk.
+        self._channels: Dict[int, int] = self._load_channels()
 
     def _ensure_file(self) -> None:
         if not self.file_path.exists():
@@ -20,34 +26,39 @@ class SetupManager:
 
     def _read(self) -> Dict[str, Dict[str, int]]:
         try:
-            with self.file_path.open("r", encoding="utf-8") as file:
-                data = json.load(file)
+            data = json_codec.loads(self.file_path.read_bytes())
             if not isinstance(data, dict) or "guild_channels" not in data:
                 return {"guild_channels": {}}
             if not isinstance(data["guild_channels"], dict):
                 data["guild_channels"] = {}
             return data
-        except (json.JSONDecodeError, OSError):
+        except (json_codec.JSONDecodeError, OSError):
             return {"guild_channels": {}}
 
     def _write(self, data: Dict[str, Dict[str, int]]) -> None:
-        with self.file_path.open("w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        write_bytes_atomic(self.file_path, json_codec.dumps(data, indent=True))
+
+    def _load_channels(self) -> Dict[int, int]:
+        channels: Dict[int, int] = {}
+        for key, value in self._read()["guild_channels"].items():
+            try:
+                channels[int(key)] = int(value)
+            except (TypeError, ValueError):
+                continue
+        return channels
+
+    def _save_channels(self) -> None:
+        self._write({"guild_channels": {str(key): value for key, value in self._channels.items()}})
 
     def set_channel(self, guild_id: int, channel_id: int) -> None:
-        data = self._read()
-        data["guild_channels"][str(guild_id)] = channel_id
-        self._write(data)
+        with self._lock:
+            self._channels[guild_id] = channel_id
+            self._save_channels()
 
     def get_channel(self, guild_id: int) -> Optional[int]:
-        data = self._read()
-        value = data["guild_channels"].get(str(guild_id))
-        if value is None:
-            return None
-        return int(value)
+        return self._channels.get(guild_id)
 
     def unset_channel(self, guild_id: int) -> None:
-        data = self._read()
-        data["guild_channels"].pop(str(guild_id), None)
-        self._write(data)
-      
+        with self._lock:
+            if self._channels.pop(guild_id, None) is not None:
+                self._save_channels()
@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
-import json
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from threading import Lock
 from typing import Dict
 
+import json_codec
+from atomic_file import write_bytes_atomic
+
+
+_COUNTER_KEYS = (
+    "total_prompt",
+    "total_completion",
+    "total_tokens",
+    "daily_prompt",
+    "daily_completion",
+    "daily_tokens",
+)
+_DEFAULTS = tuple((key, 0) for key in _COUNTER_KEYS) + (("last_reset_date", ""),)
+
 
 class TokenManager:
     """Track and persist token usage statistics."""
@@ -14,20 +29,24 @@ class TokenManager:
     def __init__(self, file_path: str = "token_stats.json") -> None:
         self.file_path = Path(file_path)
         self._ensure_file()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._today = ""
+        self._today_ends_at = 0.0
+        self._stats = self._read()
+        self._dirty = False
 
     def _default_stats(self) -> Dict[str, int | str]:
-        return {
-            "total_prompt": 0,
-            "total_completion": 0,
-            "total_tokens": 0,
-            "daily_prompt": 0,
-            "daily_completion": 0,
-            "daily_tokens": 0,
-            "last_reset_date": "",
-        }
+        return dict(_DEFAULTS)
 
     def _today_utc(self) -> str:
-        return datetime.now(timezone.utc).date().isoformat()
+        # Recomputed only once the cached UTC day is over, so a rollover is never missed.
+        if time.time() >= self._today_ends_at:
+            today = datetime.now(timezone.utc).date()
+            self._today = today.isoformat()
+            midnight = datetime(today.year, today.month, today.day, tzinfo=timezone.utc) + timedelta(days=1)
+            self._today_ends_at = midnight.timestamp()
+        return self._today
 
     def _ensure_file(self) -> None:
         if not self.file_path.exists():
@@ -35,18 +54,21 @@ class TokenManager:
 
     def _read(self) -> Dict[str, int | str]:
         try:
-            with self.file_path.open("r", encoding="utf-8") as file:
-                data = json.load(file)
-            default = self._default_stats()
-            for key, value in default.items():
+            data = json_codec.loads(self.file_path.read_bytes())
+            for key, value in _DEFAULTS:
                 data.setdefault(key, value)
+            # Counters are coerced once here so updates can add to them directly.
+            for key in _COUNTER_KEYS:
+                try:
+                    data[key] = int(data[key])
+                except (TypeError, ValueError):
+                    data[key] = 0
             return data
-        except (json.JSONDecodeError, OSError):
+        except (json_codec.JSONDecodeError, OSError):
             return self._default_stats()
 
     def _write(self, data: Dict[str, int | str]) -> None:
-        with self.file_path.open("w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        write_bytes_atomic(self.file_path, json_codec.dumps(data, indent=True))
 
     def _reset_daily_if_needed(self, data: Dict[str, int | str]) -> Dict[str, int | str]:
         today = self._today_utc()
@@ -55,25 +77,36 @@ class TokenManager:
             data["daily_completion"] = 0
             data["daily_tokens"] = 0
             data["last_reset_date"] = today
+            self._dirty = True
         return data
 
     def update_usage(self, prompt_tokens: int, completion_tokens: int, total_tokens: int) -> Dict[str, int | str]:
-        """Update persistent totals and return latest stats."""
-        data = self._reset_daily_if_needed(self._read())
+        """Update totals in memory and return latest stats; persisted on the next flush."""
+        with self._lock:
+            data = self._reset_daily_if_needed(self._stats)
 
-        data["total_prompt"] = int(data["total_prompt"]) + prompt_tokens
-        data["total_completion"] = int(data["total_completion"]) + completion_tokens
-        data["total_tokens"] = int(data["total_tokens"]) + total_tokens
+            data["total_prompt"] += prompt_tokens
+            data["total_completion"] += completion_tokens
+            data["total_tokens"] += total_tokens
 
-        data["daily_prompt"] = int(data["daily_prompt"]) + prompt_tokens
-        data["daily_completion"] = int(data["daily_completion"]) + completion_tokens
-        data["daily_tokens"] = int(data["daily_tokens"]) + total_tokens
+            data["daily_prompt"] += prompt_tokens
+            data["daily_completion"] += completion_tokens
+            data["daily_tokens"] += total_tokens
 
-        self._write(data)
-        return data
+            self._dirty = True
+            return dict(data)
 
     def get_stats(self) -> Dict[str, int | str]:
         """Return current stats after applying daily reset rule."""
-        data = self._reset_daily_if_needed(self._read())
-        self._write(data)
-        return data
+        with self._lock:
+            return dict(self._reset_daily_if_needed(self._stats))
+
+    def flush(self) -> None:
+        """Write pending stats to disk, if any."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self._stats)
+                self._dirty = False
+            self._write(snapshot)
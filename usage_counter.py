@@ -2,22 +2,45 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
 from token_manager import TokenManager
 
 
-def update_and_format_usage(usage: Any, token_manager: TokenManager) -> str:
-    """Update token counters from a Groq usage object and return a summary text."""
-    prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
-    completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
-    total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + completion_tokens) or 0)
+@dataclass(frozen=True)
+class TokenUsage:
+    """Token counts of a single completion, read once from the Groq usage object."""
 
-    stats = token_manager.update_usage(prompt_tokens, completion_tokens, total_tokens)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
 
-    return (
-        "\n\n**Token Usage**\n"
-        f"- This Message tokens: prompt={prompt_tokens}, completion={completion_tokens}, total={total_tokens}\n"
-        f"- Daily total: {stats['daily_tokens']}\n"
-        f"- Lifetime total: {stats['total_tokens']}"
+    @classmethod
+    def from_groq(cls, usage: Any) -> "TokenUsage":
+        """Build from a Groq ``CompletionUsage``; an unset total is derived from the parts."""
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        return cls(prompt_tokens, completion_tokens, usage.total_tokens or prompt_tokens + completion_tokens)
+
+
+NO_USAGE = TokenUsage()
+
+_USAGE_TEMPLATE = (
+    "\n\n**Token Usage**\n"
+    "- This Message tokens: prompt=%d, completion=%d, total=%d\n"
+    "- Daily total: %s\n"
+    "- Lifetime total: %s"
+)
+
+
+def update_and_format_usage(usage: TokenUsage, token_manager: TokenManager) -> str:
+    """Update token counters from a completion's usage and return a summary text."""
+    stats = token_manager.update_usage(usage.prompt_tokens, usage.completion_tokens, usage.total_tokens)
+    return _USAGE_TEMPLATE % (
+        usage.prompt_tokens,
+        usage.completion_tokens,
+        usage.total_tokens,
+        stats["daily_tokens"],
+        stats["total_tokens"],
     )
@@ -2,66 +2,130 @@
 
 from __future__ import annotations
 
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import gzip
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from threading import Thread
-from typing import Callable, Dict
+from typing import Callable, Dict, Tuple
 
+from ttl_cache import TTLCache
 
-class StatusWebsite:
-    """Start and serve a simple HTML dashboard in a background thread."""
-
-    def __init__(self, stats_provider: Callable[[], Dict[str, int | str]], host: str = "0.0.0.0", port: int = 8080) -> None:
-        self.stats_provider = stats_provider
-        self.host = host
-        self.port = port
-
-    def start(self) -> None:
-        """Start the HTTP server in a daemon thread."""
-        handler = self._build_handler(self.stats_provider)
-        server = ThreadingHTTPServer((self.host, self.port), handler)
-        thread = Thread(target=server.serve_forever, daemon=True)
-        thread.start()
 
-    @staticmethod
-    def _build_handler(stats_provider: Callable[[], Dict[str, int | str]]):
-        class DashboardHandler(BaseHTTPRequestHandler):
-            def do_GET(self) -> None:  # noqa: N802 (BaseHTTPRequestHandler naming)
-                stats = stats_provider()
-                html = f"""<!DOCTYPE html>
+# Static page pieces, encoded once; only the stat values are rendered per request.
+_PAGE_HEAD = b"""<!DOCTYPE html>
 <html lang='en'>
 <head>
 <meta charset='utf-8' />
 <meta name='viewport' content='width=device-width, initial-scale=1' />
 <title>UOI Discord AI Bot</title>
 <style>
-body {{ font-family: Arial, sans-serif; margin: 2rem; background: #0f172a; color: #e2e8f0; }}
-.card {{ max-width: 680px; background: #1e293b; padding: 1.5rem; border-radius: 12px; }}
-h1 {{ margin-top: 0; }}
-p {{ line-height: 1.5; }}
-.kv {{ margin: 0.4rem 0; }}
-small {{ color: #94a3b8; }}
+body { font-family: Arial, sans-serif; margin: 2rem; background: #0f172a; color: #e2e8f0; }
+.card { max-width: 680px; background: #1e293b; padding: 1.5rem; border-radius: 12px; }
+h1 { margin-top: 0; }
+p { line-height: 1.5; }
+.kv { margin: 0.4rem 0; }
+small { color: #94a3b8; }
 </style>
 </head>
 <body>
 <div class='card'>
 <h1>UOI Discord AI Bot</h1>
 <p class='kv'><strong>Status:</strong> Online</p>
-<p class='kv'><strong>Daily token usage:</strong> {stats.get('daily_tokens', 0)}</p>
-<p class='kv'><strong>Lifetime token usage:</strong> {stats.get('total_tokens', 0)}</p>
+<p class='kv'><strong>Daily token usage:</strong> """
+_PAGE_LIFETIME = b"""</p>
+<p class='kv'><strong>Lifetime token usage:</strong> """
+_PAGE_RESET_DATE = b"""</p>
 <p class='kv'><strong>UTC reset time:</strong> 00:00 UTC</p>
-<small>Last reset date: {stats.get('last_reset_date', '')}</small>
+<small>Last reset date: """
+_PAGE_TAIL = b"""</small>
 </div>
 </body>
 </html>"""
-                body = html.encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "text/html; charset=utf-8")
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
+
+
+STATS_CACHE_SECONDS = 1.0
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+def _http_response(body: bytes, extra_headers: bytes = b"") -> bytes:
+    return b"".join(
+        (
+            b"HTTP/1.0 200 OK\r\n"
+            b"Content-Type: text/html; charset=utf-8\r\n",
+            extra_headers,
+            b"Vary: Accept-Encoding\r\n"
+            b"Content-Length: %d\r\n"
+            b"\r\n" % len(body),
+            body,
+        )
+    )
+
+
+def _render_page(stats: Dict[str, int | str]) -> Tuple[bytes, bytes]:
+    """Return complete HTTP responses for the dashboard, plain and gzip-encoded."""
+    body = b"".join(
+        (
+            _PAGE_HEAD,
+            str(stats["daily_tokens"]).encode(),
+            _PAGE_LIFETIME,
+            str(stats["total_tokens"]).encode(),
+            _PAGE_RESET_DATE,
+            str(stats["last_reset_date"]).encode(),
+            _PAGE_TAIL,
+        )
+    )
+    return (
+        _http_response(body),
+        _http_response(gzip.compress(body, compresslevel=6), b"Content-Encoding: gzip\r\n"),
+    )
+
+
+class StatusWebsite:
+    """Start and serve a simple HTML dashboard in a background thread."""
+
+    def __init__(self, stats_provider: Callable[[], Dict[str, int | str]], host: str = "0.0.0.0", port: int = 8080) -> None:
+        self.stats_provider = stats_provider
+        self.host = host
+        self.port = port
+
+    def start(self) -> None:
+        """Start the HTTP server in a daemon thread."""
+        handler = self._build_handler(self._cached_page(self.stats_provider))
+        # Responses are prebuilt bytes, so one serving thread is plenty.
+        server = HTTPServer((self.host, self.port), handler)
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _cached_page(stats_provider: Callable[[], Dict[str, int | str]]) -> Callable[[], Tuple[bytes, bytes]]:
+        # Renders and compresses at most once per STATS_CACHE_SECONDS however often the page is
+        # polled, and not at all when the shown values are unchanged since the last render.
+        cache: TTLCache[Tuple[Tuple[object, ...], Tuple[bytes, bytes]]] = TTLCache(maxsize=1, ttl=STATS_CACHE_SECONDS)
+
+        def cached_page() -> Tuple[bytes, bytes]:
+            entry = cache.get(None)
+            if entry is None:
+                stats = stats_provider()
+                shown = (stats["daily_tokens"], stats["total_tokens"], stats["last_reset_date"])
+                entry = cache.get_stale(None)
+                if entry is None or entry[0] != shown:
+                    entry = (shown, _render_page(stats))
+                cache.set(None, entry)
+            return entry[1]
+
+        return cached_page
+
+    @staticmethod
+    def _build_handler(page_provider: Callable[[], Tuple[bytes, bytes]]):
+        class DashboardHandler(BaseHTTPRequestHandler):
+            # Keeps a stalled client from blocking the single serving thread.
+            timeout = REQUEST_TIMEOUT_SECONDS
+
+            def do_GET(self) -> None:  # noqa: N802 (BaseHTTPRequestHandler naming)
+                plain, gzipped = page_provider()
+                # Status line, headers and body go out in a single socket write.
+                self.wfile.write(gzipped if "gzip" in self.headers.get("Accept-Encoding", "") else plain)
 
             def log_message(self, format: str, *args) -> None:  # noqa: A003
                 return
 
         return DashboardHandler
-      